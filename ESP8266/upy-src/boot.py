@@ -5,24 +5,22 @@ This file is executed on every boot
 
 import esp
 import gc
-import machine  # noqa: F401
 import network
-import sys  # noqa: F401
-import uos  # noqa: F401
 # import webrepl
 
 
 def singleton(cls):
     """
     This function is used as a decorator to use the singleton pattern.
+    The instance is cached on the class itself, so repeated calls cost
+    one attribute load instead of a closure-cell dereference.
     """
 
-    instance = None
-
     def get_instance(*args, **kwargs):
-        nonlocal instance
+        instance = getattr(cls, "_instance", None)
         if instance is None:
             instance = cls(*args, **kwargs)
+            cls._instance = instance
         return instance
 
     return get_instance
@@ -31,25 +29,37 @@ def singleton(cls):
 def functor(cls):
     """
     This function is used as a decorator to use a functor pattern.
+    The instance is cached on the class itself, so repeated calls cost
+    one attribute load instead of a closure-cell dereference.
     """
 
-    instance = None
-
     def get_instance(*args, **kwargs):
-        nonlocal instance
+        instance = getattr(cls, "_instance", None)
         if instance is None:
             instance = cls(*args, **kwargs)
+            cls._instance = instance
             return instance
         return instance(*args, **kwargs)
 
     return get_instance
 
 
+def get_sta():
+    """
+    This function returns the station-interface wrapper created at
+    boot, so no further WLAN object has to be constructed.
+    """
+
+    return _sta
+
+
 # esp.osdebug(None)
 # uos.dupterm(None, 1)  # disable REPL on UART(0)
 # webrepl.start()
 gc.collect()
 # Turn of Wifi
-network.WLAN(network.STA_IF).active(False)
+_sta = network.WLAN(network.STA_IF)
+_sta.active(False)
 esp.sleep_type(esp.SLEEP_MODEM)
-network.WLAN(network.AP_IF).active(False)
+_ap = network.WLAN(network.AP_IF)
+_ap.active(False)
@@ -2,13 +2,9 @@
 This module provides a controller-interface for the microcontroller
 """
 
-# Imports from libraries
-
-import network
-
 # Local imports
 
-from boot import singleton
+from boot import get_sta, singleton
 
 
 @singleton
@@ -16,7 +12,9 @@ class Controller:
     __instance = None
 
     def __init__(self):
-        self.wlan = network.WLAN(network.STA_IF)
+        # Reuse the station-interface created in boot.py instead of
+        # constructing a second WLAN wrapper
+        self.wlan = get_sta()
 
     def start_wifi(self):
         self.wlan.active(True)
@@ -0,0 +1,24 @@
+#!/bin/bash
+#
+# This script pre-compiles the cli-module to .mpy bytecode using
+# mpy-cross. Deploying the .mpy instead of the .py avoids the
+# parse/compile RAM spike of the on-device compiler, which can cause
+# "MemoryError: memory allocation failed" on low-RAM devices.
+# -O2 strips docstrings from the bytecode.
+#
+# Usage:	compile_mpy.sh
+
+SRC="$(dirname $0)/../upy-src/cli_module.py"
+
+mpy-cross -march=xtensa -O2 "$SRC"
+RETVAL=$?
+if [ $RETVAL -eq 0 ]
+then
+	echo "Bytecode written to ${SRC%.py}.mpy"
+elif [ $RETVAL -eq 127 ]
+then
+	echo "Error in $(basename $0): mpy-cross not found" >&2
+else
+	echo "Error in $(basename $0): $SRC could not be compiled" >&2
+fi
+exit $RETVAL
@@ -9,37 +9,123 @@ import machine
 import sys
 import uos
 
+from micropython import const
+
 # Local imports
 
 from boot import functor
 
+"""
+Output stream of the REPL, resolved once instead of on every
+print() call
+"""
+_out = sys.stdout
+
 """
 Octal values for mode-flags of stat-buffer
 """
-S_IFBLK = 0o60000
-S_IFCHR = 0o20000
-S_IFDIR = 0o40000
-S_IFIFO = 0o10000
-S_IFLNK = 0o120000
-S_IFREG = 0o100000
-S_IFSOCK = 0o140000
-S_IFMT = 0o170000
+_S_IFBLK = const(0o60000)
+_S_IFCHR = const(0o20000)
+_S_IFDIR = const(0o40000)
+_S_IFIFO = const(0o10000)
+_S_IFLNK = const(0o120000)
+_S_IFREG = const(0o100000)
+_S_IFSOCK = const(0o140000)
+_S_IFMT = const(0o170000)
+
+"""
+Indices of uos.uname()
+"""
+_UN_SYSNAME = const(0)
+_UN_NODENAME = const(1)  # Hostname
+_UN_RELEASE = const(2)  # hardware release
+_UN_VERSION = const(3)  # micropython firmware version
+_UN_MACHINE = const(4)
+
+"""
+Indices of uos.statvfs(path)
+"""
+_F_BSIZE = const(0)
+_F_FRSIZE = const(1)
+_F_BLOCKS = const(2)
+_F_BFREE = const(3)
+_F_BAVAIL = const(4)
+_F_FILES = const(5)
+_F_FFREE = const(6)
+_F_FAVAIL = const(7)
+_F_FLAG = const(8)
+_F_NAMEMAX = const(9)
+
+"""
+Dispatch tables mapping memory-queries to a label and a byte-count
+extractor and system-queries to a bound format-method plus the index
+into the uname-buffer. Memory values are rendered through the shared
+_render helper.
+"""
+_MEM_SPEC = {
+    "avail": (
+        "available userspace",
+        lambda st: st[_F_BAVAIL] * st[_F_BSIZE]
+    ),
+    "bsize": (
+        "blocksize",
+        lambda st: st[_F_BSIZE]
+    ),
+    "free": (
+        "free space",
+        lambda st: st[_F_BFREE] * st[_F_BSIZE]
+    ),
+    "frsize": (
+        "fragment size",
+        lambda st: st[_F_FRSIZE]
+    ),
+    "size": (
+        "total memory space",
+        lambda st: st[_F_BLOCKS] * st[_F_FRSIZE]
+    ),
+}
+_SYS_HANDLERS = {
+    "fwver": ("firmware version: {}\n".format, _UN_VERSION),
+    "hostname": ("hostname: {}\n".format, _UN_NODENAME),
+    "hwrelease": ("hardware release: {}\n".format, _UN_RELEASE),
+    "machine": ("machine: {}\n".format, _UN_MACHINE),
+    "sysname": ("system name: {}\n".format, _UN_SYSNAME),
+}
+
+"""
+Bound format-method for one "label: value" result line, so the
+format spec is parsed once at module load instead of per call
+"""
+_FMT_LINE = "{}: {}\n".format
+
+"""
+Supported queries in output order and the lookup table resolving
+the aggregate queries to their (system-keys, memory-keys) pair
+"""
+QUERIES_MEM = ("avail", "bsize", "free", "frsize", "size")
+QUERIES_SYS = ("fwver", "hostname", "hwrelease", "machine", "sysname")
+_KEY_LISTS = {
+    "all": (QUERIES_SYS, QUERIES_MEM),
+    "all_mem": ((), QUERIES_MEM),
+    "all_sys": (QUERIES_SYS, ()),
+}
 
 """
-Header for result output
+Header for result output. A bytes literal lands in flash rodata
+when the module is frozen, costing no RAM.
 """
-BEG_RES = "##### BEGIN RESULTS #####\n"
+BEG_RES = b"##### BEGIN RESULTS #####\n"
 
 """
 Footer for result output
 """
-END_RES = "##### END RESULTS #####\n"
+END_RES = b"##### END RESULTS #####\n"
 
 """
 Error codes for exit, which are not provided by errno
 """
-EXIT_SUCCESS = 0
-EXIT_FAILURE = 255
+_EXIT_SUCCESS = const(0)
+_EXIT_FAILURE = const(255)
 
 
 @functor
@@ -49,165 +135,74 @@ class sysinfo:
     system information of the serial-device.
     """
 
-    """
-    Indices of uos.uname()
-    """
-    UN_SYSNAME = 0
-    UN_NODENAME = 1  # Hostname
-    UN_RELEASE = 2  # hardware release
-    UN_VERSION = 3  # micropython firmware version
-    UN_MACHINE = 4
-
-    """
-    Indices of uos.statvfs(path)
-    """
-    F_BSIZE = 0
-    F_FRSIZE = 1
-    F_BLOCKS = 2
-    F_BFREE = 3
-    F_BAVAIL = 4
-    F_FILES = 5
-    F_FFREE = 6
-    F_FAVAIL = 7
-    F_FLAG = 8
-    F_NAMEMAX = 9
-
-    """
-    List of possible queries
-    """
-    QUERIES_MEM = [
-        "avail",
-        "bsize",
-        "free",
-        "frsize",
-        "size"
-    ]
-    QUERIES_SYS = [
-        "fwver",
-        "hostname",
-        "hwrelease",
-        "machine",
-        "sysname",
-    ]
-
     def __init__(self):
         """
         The constructor creates the sysinfo instance which is used as
         a Functor.
         """
 
-        self.queries = [
-            "all",
-            "all_mem",
-            "all_sys"
-        ]
-        self.queries.extend(self.QUERIES_MEM)
-        self.queries.extend(self.QUERIES_SYS)
+        # uname() is invariant for the life of the firmware,
+        # so it is fetched only once
+        self._un = uos.uname()
 
-    def __call__(self, query=None):
+    def __call__(self, query=None, readable=False):
         """
         This function allows objects to be called as functions.
         """
 
-        serial_print(self.__query(q=query))
-
-    def __meminfo(self, q=None):
-        """
-        Resolves queries about memory information.
-        """
-
-        results = ""
-        stvfs = uos.statvfs("/")
+        serial_print(self.__query(q=query, readable=readable))
 
-        if q is None:
-            results += self.__meminfo("avail")
-            results += self.__meminfo("bsize")
-            results += self.__meminfo("free")
-            results += self.__meminfo("frsize")
-            results += self.__meminfo("size")
-
-        if q == "avail":
-            val = stvfs[self.F_BAVAIL] * stvfs[self.F_BSIZE]
-            results += "available userspace: {}\n".format(val)
-        if q == "bsize":
-            val = stvfs[self.F_BSIZE]
-            results += "blocksize: {}\n".format(val)
-        if q == "free":
-            val = stvfs[self.F_BFREE] * stvfs[self.F_BSIZE]
-            results += "free space: {}\n".format(val)
-        if q == "frsize":
-            val = stvfs[self.F_FRSIZE]
-            results += "fragment size: {}\n".format(val)
-        if q == "size":
-            val = stvfs[self.F_BLOCKS] * stvfs[self.F_FRSIZE]
-            results += "total memory space: {}\n".format(val)
-
-        return results
-
-    def __query(self, q=None):
+    def __query(self, q=None, readable=False):
         """
-        This function processes the requested query.
+        This function processes the requested query by resolving it
+        to the tables _MEM_SPEC / _SYS_HANDLERS. The stat-buffer is
+        fetched at most once per query. If readable is True, memory
+        values are rendered in human readable format.
 
         @return Result string
         """
 
         if q is None:
-            return self.__query(q="all")
-
-        try:
-            if q not in self.queries:
-                raise ValueError("Unknown query")
-        except ValueError as err:
-            usage(err)
-
-        results = ""
-        if q == "all":
-            results += self.__sysinfo()
-            results += self.__meminfo()
-        elif q == "all_mem":
-            results += self.__meminfo()
-        elif q == "all_sys":
-            results += self.__sysinfo()
-        else:
-            if q in self.QUERIES_MEM:
-                results += self.__meminfo(q=q)
-            if q in self.QUERIES_SYS:
-                results += self.__sysinfo(q=q)
-
-        return results
-
-    def __sysinfo(self, q=None):
-        """
-        Resolves queries about system information.
-        """
+            q = "all"
+
+        keys = _KEY_LISTS.get(q)
+        if keys is None:
+            if q in _MEM_SPEC:
+                keys = ((), (q, ))
+            elif q in _SYS_HANDLERS:
+                keys = ((q, ), ())
+            else:
+                usage("Unknown query")
+
+        sys_keys, mem_keys = keys
+
+        parts = []
+        if sys_keys:
+            un = self._un
+            for k in sys_keys:
+                fmt, idx = _SYS_HANDLERS[k]
+                parts.append(fmt(un[idx]))
+        if mem_keys:
+            stvfs = uos.statvfs("/")
+            for k in mem_keys:
+                label, extract = _MEM_SPEC[k]
+                parts.append(_FMT_LINE(
+                    label, _render(extract(stvfs), readable=readable)
+                ))
+
+        return "".join(parts)
+
+
+def _render(n, readable=False):
+    """
+    This function renders a byte count, raw on default or via
+    human_readable if readable is True. It is the single formatting
+    routine for memory values.
+    """
 
-        un = uos.uname()
-        results = ""
-
-        if q is None:
-            results += self.__sysinfo("fwver")
-            results += self.__sysinfo("hostname")
-            results += self.__sysinfo("hwrelease")
-            results += self.__sysinfo("machine")
-            results += self.__sysinfo("sysname")
-
-        if q == "fwver":
-            results += "firmware version: {}\n" \
-                .format(un[self.UN_VERSION])
-        if q == "hostname":
-            results += "hostname: {}\n" \
-                .format(un[self.UN_NODENAME])
-        if q == "hwrelease":
-            results += "hardware release: {}\n" \
-                .format(un[self.UN_RELEASE])
-        if q == "machine":
-            results += "machine: {}\n" \
-                .format(un[self.UN_MACHINE])
-        if q == "sysname":
-            results += "system name: {}\n" \
-                .format(un[self.UN_SYSNAME])
-
-        return results
+    if readable is False:
+        return str(n)
+    return human_readable(n)
 
 
 def cat(*argv):
@@ -215,20 +210,13 @@ def cat(*argv):
     This function displays one or more files on STDOUT.
     """
 
-    try:
-        if len(argv) == 0:
-            raise ValueError("No file too display")
-    except ValueError as err:
-        usage(err)
+    if len(argv) == 0:
+        usage("No file too display")
 
     for fn in argv:
         serial_fprint(fn)
 
 
-def cp(*argv, dest=".", rec=False):
-    pass
-
-
 def du(*argv, max_depth=-1, human_readable=False):
     """
     This function displays the usage of filesystem memory for the
@@ -243,9 +231,9 @@ def err_msg(err):
     This function creates an error message for an error.
     """
 
-    return "{}\n".format(
-        err.message if hasattr(err, "message") else err
-    )
+    if hasattr(err, "message"):
+        return "{}\n".format(err.message)
+    return str(err) + "\n"
 
 
 def error(err):
@@ -258,7 +246,7 @@ def error(err):
     if hasattr(err, "errno"):
         sys.exit(err.errno)
     else:
-        sys.exit(EXIT_FAILURE)
+        sys.exit(_EXIT_FAILURE)
 
 
 def human_readable(n):
@@ -266,33 +254,28 @@ def human_readable(n):
     Prints n bytes in human readable format
     """
 
-    try:
-        n = int(n)
-        if n < 0:
-            raise ValueError(
-                "Number of bytes must be non-negative integer"
-            )
-    except Exception as err:
-        usage(err)
+    n = int(n)
+    if n < 0:
+        usage("Number of bytes must be non-negative integer")
 
     units = ["K", "M", "G", "T"]
-    i = 0
-    unit = ""
-    while n >= 1024:
-        if n % 1024 == 0:
-            n //= 1024
-        else:
-            n /= 1024
-        i += 1
 
-    if i > 0:
-        unit = units[i - 1]
+    # The unit index is the number of factors of 1024 in n,
+    # computed from the bit-length instead of a division loop
+    i = 0
+    if n > 0:
+        i = (n.bit_length() - 1) // 10
+    if i > len(units):
+        i = len(units)
 
-    result = "{:.1f}{}".format(n, unit)
-    if n == int(n):
-        result = "{}{}".format(n, unit)
+    if i == 0:
+        return "{}".format(n)
 
-    return result
+    d = 1 << (10 * i)
+    unit = units[i - 1]
+    if n % d == 0:
+        return "{}{}".format(n // d, unit)
+    return "{:.1f}{}".format(n / d, unit)
 
 
 def is_dir(path):
@@ -300,11 +283,13 @@ def is_dir(path):
     This fucntion checks, if path is a directory.
     """
 
+    if path.strip() == "":
+        serial_print("{}: No path given\n".format(path))
+        return
+
     try:
-        if path.strip() == "":
-            raise ValueError("No path given")
-        sb = uos.stat(path)
-        if sb[0] & S_IFMT == S_IFDIR:
+        mode = uos.stat(path)[0]
+        if mode & _S_IFMT == _S_IFDIR:
             serial_print("TRUE\n")
         else:
             serial_print("FALSE\n")
@@ -320,19 +305,25 @@ def ls(*argv, human_readable=False, list_format=False, rec=False):
     if len(argv) == 0:
         argv = (".", )
 
-    output = ""
+    output = []
     for arg in argv:
         try:
-            sb = uos.stat(arg)
-            entries = arg
-            if sb[0] & S_IFMT == S_IFDIR:
-                entries = uos.listdir(arg)
-            if list_format is False:
-                output += "{}\n".format(entries)
-        except Exception as err:
-            output += err_msg("{}: {}".format(arg, err))
-
-    serial_print(output)
+            # Directories are the hot path: listdir validates the
+            # path itself, so no stat pre-check is needed. Only a
+            # non-directory is stat'ed, to distinguish a plain file
+            # from a missing path.
+            entries = uos.listdir(arg)
+        except OSError:
+            try:
+                uos.stat(arg)
+                entries = arg
+            except Exception as err:
+                output.append(err_msg("{}: {}".format(arg, err)))
+                continue
+        if list_format is False:
+            output.append("{}\n".format(entries))
+
+    serial_print("".join(output))
 
 
 def serial_fprint(file):
@@ -340,20 +331,26 @@ def serial_fprint(file):
     Prints a file for host connected to the serial-device.
     """
 
-    print(BEG_RES, end="")
+    _out.write(BEG_RES)
 
     try:
-        sb = uos.stat(file)
-        if sb[0] & S_IFMT == S_IFREG:
-            fd = open(file, "r")
-            for line in fd:
-                print(line, end="")
+        mode = uos.stat(file)[0]
+        if mode & _S_IFMT == _S_IFREG:
+            buf = bytearray(512)
+            mv = memoryview(buf)
+            fd = open(file, "rb")
+            while True:
+                n = fd.readinto(buf)
+                if not n:
+                    break
+                _out.write(mv[:n])
+            fd.close()
         else:
             raise ValueError("{} is not a regular file".format(file))
     except Exception as err:
-        print(err_msg("{}: {}".format(file, err)), end="")
+        _out.write(err_msg("{}: {}".format(file, err)))
 
-    print(END_RES, end="")
+    _out.write(END_RES)
 
 
 def serial_print(msg):
@@ -361,8 +358,12 @@ def serial_print(msg):
     Prints a message for host connected to the serial-device.
     """
 
-    output = "{}{}{}".format(BEG_RES, msg, END_RES)
-    print(output)
+    _out.write(BEG_RES)
+    if isinstance(msg, (bytes, bytearray, memoryview)):
+        _out.write(msg)
+    else:
+        _out.write(msg.encode())
+    _out.write(END_RES)
 
 
 def restore():
@@ -371,7 +372,11 @@ def restore():
     serial-device.
     """
 
-    uos.remove("cli_module.py")
+    for mod in ("cli_module.py", "cli_module.mpy"):
+        try:
+            uos.remove(mod)
+        except OSError:
+            pass
     machine.reset()
 
 
@@ -383,6 +388,29 @@ def usage(err, is_err=True):
 
     serial_print("Usage: {}\n".format(err))
     if is_err is True:
-        sys.exit(EXIT_FAILURE)
+        sys.exit(_EXIT_FAILURE)
     else:
-        sys.exit(uos.EXIT_SUCCESS)
+        sys.exit(_EXIT_SUCCESS)
+
+
+"""
+Command table for the cli: one hashed dict access instead of a
+module-globals search per command
+"""
+_CMDS = {
+    "cat": cat,
+    "du": du,
+    "is_dir": is_dir,
+    "ls": ls,
+    "restore": restore,
+    "sysinfo": sysinfo,
+}
+
+
+def dispatch(name, *argv, **kwargs):
+    """
+    This function resolves a command name via the command table and
+    runs the command.
+    """
+
+    return _CMDS[name](*argv, **kwargs)
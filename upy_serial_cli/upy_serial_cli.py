@@ -7,11 +7,14 @@ serial-connection, which provides basic filesystem
 commands.
 """
 
-import getopt
-import inspect
+import argparse
 import os
+import queue
+import readline  # noqa: F401
 from serial import Serial, serialutil
+import shlex
 import sys
+import threading
 import time
 
 """
@@ -37,35 +40,199 @@ def error(err):
         sys.exit(EXIT_FAILURE)
 
 
+"""
+Usage text of the program, formatted once at module load and
+emitted with a single write
+"""
+_USAGE = (
+    "Usage: {} [OPTIONS] [COMMAND]\n\n"
+    "OPTIONS:\n\n"
+    "-b <baudrate>: "
+    "Baudrate for serial-connection, requires option \"-p\" "
+    "(Default: 115200, boards configured for higher rates "
+    "accept e.g. 921600 or 2000000)\n\n"
+    "-i: Interactive mode, requires option \"-p\", "
+    "on default, non-interactive mode is used and a "
+    "COMMAND is expected\n\n"
+    "-h: Show help\n\n"
+    "-p <serial_port>: "
+    "Serial port / device required to setup"
+    "serial-connection\n\n"
+    "COMMAND:\n\n"
+    "Run command help to see commands.\n"
+    .format(sys.argv[0])
+)
+
+
 def usage(is_err=True):
     """
     This function raises a usage-error, when this programm
     is executed incorrect via commandline.
     """
 
-    print(
-        "Usage: {} [OPTIONS] [COMMAND]\n\n"
-        "OPTIONS:\n\n"
-        "-b <baudrate>: "
-        "Baudrate for serial-connection, requires option \"-p\" "
-        "(Default: 9600)\n\n"
-        "-i: Interactive mode, requires option \"-p\", "
-        "on default, non-interactive mode is used and a "
-        "COMMAND is expected\n\n"
-        "-h: Show help\n\n"
-        "-p <serial_port>: "
-        "Serial port / device required to setup"
-        "serial-connection\n\n"
-        "COMMAND:\n\n"
-        "Run command help to see commands."
-        .format(sys.argv[0]),
-        file=sys.stderr
-    )
-
     if is_err is True:
+        sys.stderr.write(_USAGE)
         sys.exit(EXIT_FAILURE)
-    else:
-        sys.exit(EXIT_SUCCESS)
+    sys.stdout.write(_USAGE)
+    sys.exit(EXIT_SUCCESS)
+
+
+"""
+Argument parser for the program invocation, built once at module
+load. Help and error output stay with usage(), so the parser does
+not add its own. The command with its arguments is captured as a
+remainder: program options are only taken from before the command
+word, so e.g. a "-h" behind the command reaches the command.
+"""
+_PARSER = argparse.ArgumentParser(add_help=False)
+_PARSER.add_argument("-b", dest="baudrate")
+_PARSER.add_argument("-h", dest="help", action="store_true")
+_PARSER.add_argument("-i", dest="interactive", action="store_true")
+_PARSER.add_argument("-p", dest="port")
+_PARSER.add_argument("args", nargs=argparse.REMAINDER)
+
+"""
+Help templates of the commands, built once at module load.
+They are only formatted when help is actually requested.
+"""
+_HELP_TEMPLATES = {
+    "cat":
+        "USAGE:\n\n"
+        "cat [OPTIONS] <file_1> [file_2 ... file_n]\n\n"
+        "DESCRIPTION:\n\n"
+        "{descr}\n\n"
+        "OPTIONS:\n\n"
+        "-h: Print help about this command",
+    "cp":
+        "USAGE:\n\n"
+        "cp [OPTIONS] <src_1> [src_2 ... src_n]> <target>\n\n"
+        "DESCRIPTION:\n\n"
+        "{descr}\n\n"
+        "On default sources are interpreted as local "
+        "files / directories, whereas the destination "
+        "is interpreted as a path on the "
+        "serial-device.\n\n"
+        "Copying files from local source to local "
+        "destination is not permitted. Use the actual "
+        "\"cp\"-program (man 1 cp) for that "
+        "operation\n\n"
+        "OPTIONS:\n\n"
+        "-h: Print help about this command\n\n"
+        "-r: Copy directories recursively\n\n"
+        "-s <serial|local>: Copy sources from the "
+        "serial- / local device\n\n"
+        "-d <serial|local>: Copy to destination on the "
+        "serial- / local device",
+    "du":
+        "USAGE:\n\n"
+        "du [OPTIONS] [file_1 file_2 ... file_n]\n\n"
+        "DESCRIPTION:\n\n"
+        "{descr}\n\n"
+        "OPTIONS:\n\n"
+        "-d n: Maximal depth of n, n = 0, 1, 2, ...\n\n"
+        "-f: Human readable memory output format\n\n"
+        "-h: Print help about this command",
+    "exit":
+        "USAGE:\n\n"
+        "exit [OPTIONS]\n\n"
+        "DESCRIPTION:\n\n"
+        "{descr}\n\n"
+        "OPTIONS:\n\n"
+        "-h: Print help about this command",
+    "free":
+        "USAGE:\n\n"
+        "free [OPTIONS]\n\n"
+        "DESCRIPTION:\n\n"
+        "{descr}\n\n"
+        "OPTIONS:\n\n"
+        "-h: Print help about this command",
+    "help":
+        "USAGE:\n\n"
+        "help [OPTIONS] COMMAND\n\n"
+        "DESCRIPTION:\n\n"
+        "{descr}\n\n"
+        "OPTIONS:\n\n"
+        "-h: Print help about this command\n\n"
+        "COMMAND: Print help about command COMMAND",
+    "ls":
+        "USAGE:\n\n"
+        "ls [OPTIONS] [file_1 ... file_n]\n\n"
+        "DESCRIPTION:\n\n"
+        "{descr}\n\n"
+        "OPTIONS:\n\n"
+        "-f: Human readable memory output format\n\n"
+        "-h: Print help about this command\n\n"
+        "-l: Print detailed list of "
+        "file information\n\n"
+        "-r: Traverse directories recursively",
+    "mkdir":
+        "USAGE:\n\n"
+        "mkdir [OPTIONS] <dir_1> [dir_2 ... dir_n]\n\n"
+        "DESCRIPTION:\n\n"
+        "{descr}\n\n"
+        "OPTIONS:\n\n"
+        "-h: Print help about this commandi\n\n"
+        "-p: Create parent directories if not existent",
+    "mv":
+        "USAGE:\n\n"
+        "mv [OPTIONS] <src_1> [src_2 ... src_n]> <target>\n\n"
+        "DESCRIPTION:\n\n"
+        "{descr}\n\n"
+        "On default sources are interpreted as local "
+        "files / directories, whereas the destination "
+        "is interpreted as a path on the "
+        "serial-device.\n\n"
+        "Moving files from local source to local "
+        "destination is not permitted. Use the actual "
+        "\"mv\"-command (man 1 mv) for that "
+        "operation\n\n"
+        "OPTIONS:\n\n"
+        "-h: Print help about this command\n\n"
+        "-s <serial|local>: Copy sources from the "
+        "serial- / local device\n\n"
+        "-d <serial|local>: Copy to destination on the "
+        "serial- / local device",
+    "restore":
+        "USAGE:\n\n"
+        "restore [OPTIONS]\n\n"
+        "DESCRIPTION:\n\n"
+        "{descr}\n\n"
+        "OPTIONS:\n\n"
+        "-h: Print help about this command",
+    "rm":
+        "USAGE:\n\n"
+        "rm [OPTIONS] <file_1> [file_2 ... file_n]\n\n"
+        "DESCRIPTION:\n\n"
+        "{descr}\n\n"
+        "OPTIONS:\n\n"
+        "-h: Print help about this command\n\n"
+        "-r: Removes a directory recursively",
+    "sysinfo":
+        "USAGE:\n\n"
+        "sysinfo [OPTIONS]\n\n"
+        "DESCRIPTION:\n\n"
+        "{descr}\n\n"
+        "OPTIONS:\n\n"
+        "-h: Print help about this command\n\n"
+        "-q QUERY: Specifies the query which information are "
+        "required\n\n"
+        "QUERIES:\n\n"
+        "all: All MEMORY QUERIES and SYSTEM QUERIES (default)\n"
+        "all_mem: All MEMORY QUERIES\n"
+        "all_sys: All SYSTEM QUERIES\n\n"
+        "MEMORY QUERIES:\n\n"
+        "avail: Available memory space for users\n"
+        "bsize: Blocksize\n"
+        "free: Free memory space on serial-device\n"
+        "frsize: Fragment size\n"
+        "size: Total memory space of serial-device\n\n"
+        "SYSTEM QUERIES:\n\n"
+        "fwver: Micropython firmware version\n"
+        "hostname: Hostname of the serial-device\n"
+        "hwrelease: Hardware release of the device\n"
+        "machine: Machine label of serial-device\n"
+        "sysname: System name of serial-device",
+}
 
 
 class upy_serial_cli:
@@ -75,14 +242,12 @@ class upy_serial_cli:
     """
 
     """
-    Default value for baudrate of a serial-connection
+    Default value for baudrate of a serial-connection. The
+    micropython REPL runs at 115200 on common boards; boards
+    reconfigured for a higher rate can pass it via option "-b"
+    (e.g. 921600 or 2000000), which linearly cuts time-on-wire.
     """
-    DEFAULT_BAUDRATE = 9600
-
-    """
-    Default value for waiting after writing to serial-buffer.
-    """
-    DEFAULT_WAIT = 0.1
+    DEFAULT_BAUDRATE = 115200
 
     """
     Defaul value for timeout in seconds, which is used for
@@ -91,14 +256,17 @@ class upy_serial_cli:
     DEFAULT_TIMEOUT = 1
 
     """
-    Default value for size of write-buffer via serial-connection.
+    Size of the receive-buffer requested from the serial-backend.
+    Only the Windows backend exposes the kernel ring; the termios
+    backends size it themselves.
     """
-    DEFAULT_SER_WRBUF_SIZE = 256
+    DEFAULT_SER_RDBUF_SIZE = 131072
 
     """
-    Default value for size of read-buffer via serial-connection.
+    Default payload size of one coalesced fd.write statement when
+    transferring a file to the serial-device.
     """
-    DEFAULT_SER_RDBUF_SIZE = 1000
+    DEFAULT_FWRITE_BATCH_SIZE = 4096
 
     """
     List of commands, that can be used via the serial-shell.
@@ -118,6 +286,12 @@ class upy_serial_cli:
         "sysinfo"
     ]
 
+    """
+    Set-view of COMMANDS for hashed membership tests in the
+    dispatch paths; COMMANDS keeps the output order for help
+    """
+    _COMMAND_SET = frozenset(COMMANDS)
+
     """
     Default path for this program.
     """
@@ -128,6 +302,11 @@ class upy_serial_cli:
     """
     CLI_MOD = "cli_module.py"
 
+    """
+    Full local path of the cli-module, joined once
+    """
+    CLI_MOD_PATH = os.path.join(DEFAULT_PATH, CLI_MOD)
+
     """
     dictionary of characters, which are replaced
     when transferring source-code via serial-connection.
@@ -140,6 +319,82 @@ class upy_serial_cli:
         "\'": "\\'",
     }
 
+    """
+    Translation table precompiled from SUBSTITUTES, so escaping a
+    line is one C-level pass instead of one scan per substitute.
+    Unlike sequential replace() calls, translate() cannot re-escape
+    the backslashes introduced by an earlier pass.
+    """
+    TRANSLATE_TABLE = str.maketrans(SUBSTITUTES)
+
+    """
+    Cache for command descriptions computed by func_descr
+    """
+    _DESCR_CACHE = {}
+
+    """
+    Cache for fully formatted help messages built by cmd_help
+    """
+    _HELP_CACHE = {}
+
+    """
+    sysinfo-queries whose result never changes while the device is
+    running. Their replies are cached per session, so repeating
+    such a query costs a dict lookup instead of a serial
+    round-trip. Queries touching memory values stay uncached.
+    """
+    STATIC_QUERIES = frozenset((
+        "all_sys",
+        "fwver",
+        "hostname",
+        "hwrelease",
+        "machine",
+        "sysname"
+    ))
+
+    """
+    Precomputed argument parsers for the commands taking options,
+    built once at class-creation time. Choice validation is native.
+    The -h convention of the commands is handled before parsing, so
+    the parsers do not add their own help.
+    """
+    _CP_PARSER = argparse.ArgumentParser(prog="cp", add_help=False)
+    _CP_PARSER.add_argument("-r", dest="rec", action="store_true")
+    _CP_PARSER.add_argument(
+        "-s", dest="src_dev", choices=("serial", "local"),
+        default="local"
+    )
+    _CP_PARSER.add_argument(
+        "-d", dest="dest_dev", choices=("serial", "local"),
+        default="serial"
+    )
+    _CP_PARSER.add_argument("args", nargs="*")
+
+    _DU_PARSER = argparse.ArgumentParser(prog="du", add_help=False)
+    _DU_PARSER.add_argument(
+        "-d", dest="max_depth", type=int, default=-1
+    )
+    _DU_PARSER.add_argument(
+        "-f", dest="human_readable", action="store_true"
+    )
+    _DU_PARSER.add_argument("args", nargs="*")
+
+    _LS_PARSER = argparse.ArgumentParser(prog="ls", add_help=False)
+    _LS_PARSER.add_argument(
+        "-f", dest="human_readable", action="store_true"
+    )
+    _LS_PARSER.add_argument(
+        "-l", dest="list_format", action="store_true"
+    )
+    _LS_PARSER.add_argument("-r", dest="rec", action="store_true")
+    _LS_PARSER.add_argument("args", nargs="*")
+
+    _SYSINFO_PARSER = argparse.ArgumentParser(
+        prog="sysinfo", add_help=False
+    )
+    _SYSINFO_PARSER.add_argument("-q", dest="query", default="all")
+    _SYSINFO_PARSER.add_argument("args", nargs="*")
+
     """
     Header for result output
     """
@@ -150,12 +405,23 @@ class upy_serial_cli:
     """
     END_RES = "##### END RESULTS #####"
 
+    """
+    Encoded framing markers for matching raw replies
+    """
+    BEG_RES_B = BEG_RES.encode("utf-8")
+    END_RES_B = END_RES.encode("utf-8")
+
     def __init__(self, port, baudrate):
         """
         Constructor: Checks, if a connection to the specified
         serial-device can be established.
         """
 
+        self._rx_thread = None
+
+        # Per-session cache for the static sysinfo-queries
+        self._sys_cache = {}
+
         try:
             # Set tty-port for serial-connection
             self.port = port
@@ -168,12 +434,43 @@ class upy_serial_cli:
                 if self.baudrate <= 0:
                     raise ValueError()
 
-            # Create instance for serial-conncection
+            # Create instance for serial-conncection. The port is
+            # opened exactly once here and stays open for the whole
+            # session. DTR/RTS are cleared before opening, because
+            # toggling them on open resets common ESP-boards via
+            # their auto-program circuit, costing a full reboot.
             self.ser_conn = Serial(
-                port=self.port,
                 baudrate=self.baudrate,
                 timeout=upy_serial_cli.DEFAULT_TIMEOUT
             )
+            self.ser_conn.port = self.port
+            self.ser_conn.dtr = False
+            self.ser_conn.rts = False
+            self.ser_conn.open()
+
+            # Drop whatever sits in the buffers from before the
+            # session (boot banner, half-read replies), so the
+            # connect probe below does not read past stale bytes
+            # or wait on a timed drain
+            self.ser_conn.reset_input_buffer()
+            self.ser_conn.reset_output_buffer()
+
+            # USB-serial adapters hold received bytes for up to 16ms
+            # before delivering them; low-latency mode removes that
+            # fixed delay from every round-trip. Not every backend
+            # supports it (e.g. ptys), so failure is ignored.
+            try:
+                self.ser_conn.set_low_latency_mode(True)
+            except (ValueError, NotImplementedError, OSError):
+                pass
+
+            # A large receive-buffer keeps multi-KB replies (e.g.
+            # ls of a big directory) intact while the host is busy
+            # between reads
+            if hasattr(self.ser_conn, "set_buffer_size"):
+                self.ser_conn.set_buffer_size(
+                    rx_size=upy_serial_cli.DEFAULT_SER_RDBUF_SIZE
+                )
 
             # Check, if module for cli is already on the serial-device
             # If this is not the case transfer module and reboot
@@ -183,26 +480,35 @@ class upy_serial_cli:
                 "print(\"### {{}} ###\".format(err))\r\n\r\n"
                 .format(upy_serial_cli.CLI_MOD)
             )
-            output = self.serial_read()
-            self.ser_conn.close()
+            # The REPL prompt after execution is the natural frame
+            # terminator of the probe, so the read returns without
+            # running into the timeout
+            output = self.serial_read(sentinel=b">>> ")
 
             if len(output) > 0:
-                output = output.split("\r\n")
+                output = output.split(b"\r\n")
 
             if (
                 len(output) == 0 or
-                "### [Errno 2] ENOENT ###" in output
+                b"### [Errno 2] ENOENT ###" in output
             ):
                 print("Transferring cli-module ...")
                 self.cp(
-                    "{}/{}".format(
-                        upy_serial_cli.DEFAULT_PATH,
-                        upy_serial_cli.CLI_MOD
-                    ),
+                    upy_serial_cli.CLI_MOD_PATH,
                     upy_serial_cli.CLI_MOD
                 )
                 print("... Done!\nRebooting device ...")
                 sys.exit(EXIT_SUCCESS)
+
+            # From here on a background thread drains the port and
+            # queues complete result frames, so writing the next
+            # command overlaps with reading the previous reply
+            self._last_rx = time.monotonic()
+            self._rx_q = queue.Queue()
+            self._rx_thread = threading.Thread(
+                target=self._reader, daemon=True
+            )
+            self._rx_thread.start()
         except ValueError:
             usage()
         except serialutil.SerialException as e:
@@ -213,27 +519,71 @@ class upy_serial_cli:
         Destructor: Restarts serial-device
         """
 
-        self.ser_conn.open()
         self.serial_write(
             "import machine\r\n"
             "machine.reset()\r\n"
         )
         self.ser_conn.close()
 
+    def _reader(self):
+        """
+        This function runs on the background reader-thread. It
+        drains the port continuously and pushes each complete frame
+        (terminated by END_RES) onto the receive-queue. Echo and
+        other unframed output is consumed along the way. Once the
+        REPL prompt follows a framed reply, a None marker is queued
+        to signal the end of that reply.
+        """
+
+        buf = bytearray()
+        end_b = upy_serial_cli.END_RES_B
+        scanned = 0
+        framed = False
+        while self.ser_conn.is_open:
+            try:
+                data = self.ser_conn.read(
+                    self.ser_conn.in_waiting or 1
+                )
+            except (OSError, serialutil.SerialException):
+                break
+            if not data:
+                continue
+            self._last_rx = time.monotonic()
+            buf += data
+            # Resume the marker scan where the previous one ended
+            # (minus a possible marker split across chunks), so
+            # each byte is scanned once even while a large reply
+            # accumulates
+            start = scanned - len(end_b) + 1
+            if start < 0:
+                start = 0
+            while True:
+                idx = buf.find(end_b, start)
+                if idx < 0:
+                    scanned = len(buf)
+                    break
+                cut = idx + len(end_b)
+                self._rx_q.put(bytes(buf[:cut]))
+                framed = True
+                del buf[:cut]
+                start = 0
+                scanned = 0
+            # The prompt after the executed statement ends its
+            # reply. Only statements that produced frames get the
+            # marker: plain statements (e.g. the fd.write batches
+            # of serial_fwrite) echo a prompt as well, but nobody
+            # reads a reply for them.
+            if framed and buf.endswith(b">>> "):
+                self._rx_q.put(None)
+                framed = False
+
     def argv_to_str(self, argv):
         """
         Transforms an argument list to string format matching:
         "arg_1", "arg_2", ... , "arg_n"
         """
 
-        result = ""
-
-        for i in range(len(argv)):
-            result += "\"{}\"{}".format(
-                argv[i], ", " if i != len(argv) - 1 else ""
-            )
-
-        return result
+        return ", ".join("\"{}\"".format(arg) for arg in argv)
 
     def cat(self, *argv):
         """
@@ -244,25 +594,30 @@ class upy_serial_cli:
         if len(argv) == 0 or "-h" in argv:
             # If help option is specified or no file is given as an
             # argument the helpmessage is displayed.
-            strout = \
-                "USAGE:\n\n" \
-                "cat [OPTIONS] <file_1> [file_2 ... file_n]\n\n" \
-                "DESCRIPTION:\n\n" \
-                "{}\n\n" \
-                "OPTIONS:\n\n" \
-                "-h: Print help about this command" \
-                .format(self.func_descr())
-            self.helpmsg(strout)
+            self.cmd_help("cat")
         else:
             # Display content of specified files
             args = self.argv_to_str(argv)
-            self.ser_conn.open()
             self.serial_write(
                 "cat({})\r\n".format(args)
             )
             results = self.serial_read()
-            self.ser_conn.close()
-            print(self.extract_results(results))
+            self.print_results(self.extract_results(results))
+
+    def cmd_help(self, command):
+        """
+        This function prints the help message of the specified
+        command. The formatted message is cached per command, so
+        the template is only filled on the first request.
+        """
+
+        msg = upy_serial_cli._HELP_CACHE.get(command)
+        if msg is None:
+            msg = _HELP_TEMPLATES[command].format(
+                descr=self.func_descr(command)
+            )
+            upy_serial_cli._HELP_CACHE[command] = msg
+        self.helpmsg(msg)
 
     def cp(self, *argv):
         """
@@ -272,77 +627,32 @@ class upy_serial_cli:
 
         if "-h" in argv:
             # If help option is specified helpmessage is displayed.
-            strout = \
-                "USAGE:\n\n" \
-                "cp [OPTIONS] <src_1> [src_2 ... src_n]> <target>\n\n" \
-                "DESCRIPTION:\n\n" \
-                "{}\n\n" \
-                "On default sources are interpreted as local " \
-                "files / directories, whereas the destination " \
-                "is interpreted as a path on the " \
-                "serial-device.\n\n" \
-                "Copying files from local source to local " \
-                "destination is not permitted. Use the actual " \
-                "\"cp\"-program (man 1 cp) for that " \
-                "operation\n\n" \
-                "OPTIONS:\n\n" \
-                "-h: Print help about this command\n\n" \
-                "-r: Copy directories recursively\n\n" \
-                "-s <serial|local>: Copy sources from the " \
-                "serial- / local device\n\n" \
-                "-d <serial|local>: Copy to destination on the " \
-                "serial- / local device" \
-                .format(self.func_descr())
-            self.helpmsg(strout)
+            self.cmd_help("cp")
         else:
             # Resolve arguments
-            opts = None
-            args = None
             try:
-                opts, args = getopt.getopt(argv, "rs:d:")
-            except getopt.GetoptError:
+                opts = upy_serial_cli._CP_PARSER.parse_args(argv)
+            except SystemExit:
                 self.cp("-h")
                 return -1
 
             # There must be at least one source and one target
-            if len(args) < 2:
+            if len(opts.args) < 2:
                 self.cp("-h")
                 return -1
 
             # Disassemble sources and target
-            srcs = args[:-1:]
-            dest = args[-1]
+            srcs = opts.args[:-1:]
+            dest = opts.args[-1]
 
-            # Check options
+            # Location of sources and destination
             # Default:
             # - No recursion
             # - sources from local device,
             # - destination on serial-device
-            s = "local"
-            d = "serial"
-            rec = False
-            for opt in opts:
-                if opt[0] == "-s":
-                    if not (
-                        opt[1] == "serial" or
-                        opt[1] == "local"
-                    ):
-                        self.cp("-h")
-                        return -1
-                    else:
-                        s = opt[1]
-
-                if opt[0] == "-d":
-                    if not (
-                        opt[1] == "serial" or
-                        opt[1] == "local"
-                    ):
-                        self.cp("-h")
-                        return -1
-                    else:
-                        d = opt[1]
-                if opt[0] == "-r":
-                    rec = True
+            s = opts.src_dev
+            d = opts.dest_dev
+            rec = opts.rec  # noqa: F841
 
             # Run cp() for the specified location of sources
             # and destination
@@ -362,15 +672,10 @@ class upy_serial_cli:
                 # If cli-module is initiated, transfer it directly
                 if (
                     len(srcs) == 1 and
-                    srcs[0] == "{}/{}".format(
-                        upy_serial_cli.DEFAULT_PATH,
-                        upy_serial_cli.CLI_MOD
-                    ) and
+                    srcs[0] == upy_serial_cli.CLI_MOD_PATH and
                     dest == upy_serial_cli.CLI_MOD
                 ):
-                    self.ser_conn.open()
                     self.serial_fwrite(srcs[0], dest)
-                    self.ser_conn.close()
                 else:
                     try:
                         # Check dest: Cannot be empty
@@ -379,60 +684,37 @@ class upy_serial_cli:
                                 "Destination path cannot be empty"
                             )
 
-                        # Check if dest is a directory
-                        self.ser_conn.open()
-                        self.serial_write(
-                            "is_dir(\"{}\")\r\n".format(dest)
-                        )
-                        results = self.serial_read()
-                        results = self.extract_results(results)
-                        results = results.strip()
-
                         # Deduplicate list of sources:
                         # Each source must be unique
                         srcs = self.dedup(*srcs)
 
-                        if results == "TRUE":
-                            # Copy into directory
-                            for src in srcs:
-                                self.serial_fwrite(
-                                    src, "{}/{}".format(
-                                        dest, os.path.basename(src)
-                                    )
-                                )
-                        elif results == "FALSE":
-                            if len(srcs) == 1:
-                                # File exists and only one source:
-                                # Copy into file
-                                self.serial_fwrite(srcs[0], dest)
-                            else:
-                                # dest is not a directory:
-                                # Cannot copy multiple files
-                                raise ValueError(
-                                    "{} is not a directory: Cannot "
-                                    "copy files"
-                                    .format(dest)
-                                )
-                        else:
-                            # dest does not exist
-                            if len(srcs) == 1:
-                                # File dest does not exist and only
-                                # one source: Copy into new file dest
-                                self.serial_fwrite(srcs[0], dest)
-                            else:
-                                # Directory dest needs to be created
-                                # before copying multiple sources into
-                                # it
+                        # With several sources the destination
+                        # must be a directory, otherwise every
+                        # source would overwrite the same file.
+                        # One is_dir round-trip validates this
+                        # for the whole copy; a single source
+                        # resolves its destination device-side
+                        # (see serial_fwrite) without a probe.
+                        if len(srcs) > 1:
+                            self.serial_write(
+                                "is_dir(\"{}\")\r\n".format(dest)
+                            )
+                            results = self.extract_results(
+                                self.serial_read()
+                            )
+                            if results.strip() != b"TRUE":
                                 raise ValueError(
-                                    "Directory {} does not exist: "
+                                    "{} is not a directory: "
                                     "Cannot copy files"
                                     .format(dest)
                                 )
 
+                        for src in srcs:
+                            self.serial_fwrite(
+                                src, dest, resolve_dest=True
+                            )
                     except Exception as err:
                         error(err)
-                    finally:
-                        self.ser_conn.close()
 
             if s == "serial" and d == "local":
                 """
@@ -456,14 +738,9 @@ class upy_serial_cli:
         @return deduplicated list of pathes on success, None on error
         """
 
-        result = []
-
-        for p in pathes:
-            p = os.path.realpath(p)
-            if p not in result:
-                result.append(p)
-
-        return result
+        return list(dict.fromkeys(
+            os.path.realpath(p) for p in pathes
+        ))
 
     def du(self, *argv):
         """
@@ -473,55 +750,31 @@ class upy_serial_cli:
 
         if "-h" in argv:
             # If help option is specified the helpmessage is displayed.
-            strout = \
-                "USAGE:\n\n" \
-                "du [OPTIONS] [file_1 file_2 ... file_n]\n\n" \
-                "DESCRIPTION:\n\n" \
-                "{}\n\n" \
-                "OPTIONS:\n\n" \
-                "-d n: Maximal depth of n, n = 0, 1, 2, ...\n\n" \
-                "-f: Human readable memory output format\n\n" \
-                "-h: Print help about this command" \
-                .format(self.func_descr())
-            self.helpmsg(strout)
+            self.cmd_help("du")
         else:
             # Resolve arguments
-            opts = None
-            args = None
-            try:
-                opts, args = getopt.getopt(argv, "d:hf")
-            except getopt.GetoptError:
-                self.cp("-h")
-                return -1
-
-            # Check options:
-            # Default:
+            # Defaults:
             # max_depth = -1: Traverse full depth
             # human_readable = False: Display memory output in bytes
-            max_depth = -1
-            human_readable = False
-            for opt in opts:
-                if opt[0] == "-d":
-                    max_depth = int(opt[1])
-                    if max_depth <= 0:
-                        ValueError()
-                if opt[0] == "-f":
-                    human_readable = True
+            try:
+                opts = upy_serial_cli._DU_PARSER.parse_args(argv)
+            except SystemExit:
+                self.du("-h")
+                return -1
 
             # If no path is given "." is set
+            args = opts.args
             if len(args) == 0:
                 args = (".", )
 
             # Run du() for the specified pathes on serial-device
-            self.ser_conn.open()
             args = self.argv_to_str(args)
             self.serial_write(
                 "du({}, max_depth={}, human_readable={})\r\n"
-                .format(args, max_depth, human_readable)
+                .format(args, opts.max_depth, opts.human_readable)
             )
             results = self.serial_read()
-            self.ser_conn.close()
-            print(self.extract_results(results))
+            self.print_results(self.extract_results(results))
 
     def exit(self, *argv):
         """
@@ -530,37 +783,39 @@ class upy_serial_cli:
 
         if "-h" in argv:
             # If help option is specified helpmessage is displayed.
-            strout = \
-                "USAGE:\n\n" \
-                "exit [OPTIONS]\n\n" \
-                "DESCRIPTION:\n\n" \
-                "{}\n\n" \
-                "OPTIONS:\n\n" \
-                "-h: Print help about this command" \
-                .format(self.func_descr())
-            self.helpmsg(strout)
+            self.cmd_help("exit")
         else:
             # Exit shell
             sys.exit(EXIT_SUCCESS)
 
-    def extract_results(self, res_str):
+    def extract_results(self, raw):
         """
-        This function extracts the results from the string
-        res_str. Each result is marked by BEG_RES and END_RES.
+        This function extracts the results from the raw reply bytes.
+        Each result is marked by BEG_RES and END_RES. The payload
+        is returned as the raw bytes the device sent, so it can be
+        written to STDOUT without a decode/encode round-trip.
         """
 
         results = None
         try:
-            results = res_str.split("\r\n")
-            results = "\n".join(results)
-            results = results.split(upy_serial_cli.BEG_RES)
-            if len(results) == 1:
+            i = raw.find(upy_serial_cli.BEG_RES_B)
+            if i < 0:
                 raise ValueError("No results found")
-            results = "".join(results[1::])
-            results = results.split(upy_serial_cli.END_RES)
-            if len(results) == 1:
+            j = raw.rfind(upy_serial_cli.END_RES_B)
+            if j < i:
                 raise ValueError("Result incomplete")
-            results = "".join(results[:-1:])
+
+            # Extract only the payload between the outer markers;
+            # the REPL echo around it is never touched
+            payload = raw[i + len(upy_serial_cli.BEG_RES_B):j]
+            results = payload.replace(b"\r\n", b"\n")
+
+            # A reply may carry several frames (e.g. cat with more
+            # than one file): strip the markers between them
+            if upy_serial_cli.BEG_RES_B in results:
+                results = results \
+                    .replace(upy_serial_cli.END_RES_B, b"") \
+                    .replace(upy_serial_cli.BEG_RES_B, b"")
         except ValueError as err:
             error(err)
 
@@ -573,15 +828,7 @@ class upy_serial_cli:
 
         if "-h" in argv:
             # If help option is specified helpmessage is displayed.
-            strout = \
-                "USAGE:\n\n" \
-                "free [OPTIONS]\n\n" \
-                "DESCRIPTION:\n\n" \
-                "{}\n\n" \
-                "OPTIONS:\n\n" \
-                "-h: Print help about this command" \
-                .format(self.func_descr())
-            self.helpmsg(strout)
+            self.cmd_help("free")
         else:
             self.sysinfo("-q", "free")
 
@@ -590,15 +837,21 @@ class upy_serial_cli:
         This function returns the description of the specified function.
         If fn is None the description of the function, which is
         the previous on stack (calling function), is returned.
+        Descriptions are cached per function name.
         """
 
-        func = None
         if fn is None:
-            func = getattr(self, inspect.stack()[1].function)
-        else:
+            # sys._getframe only touches the calling frame, whereas
+            # inspect.stack() reifies the whole stack
+            fn = sys._getframe(1).f_code.co_name
+
+        descr = upy_serial_cli._DESCR_CACHE.get(fn)
+        if descr is None:
             func = getattr(self, fn)
+            descr = " ".join(func.__doc__.lstrip().split())
+            upy_serial_cli._DESCR_CACHE[fn] = descr
 
-        return " ".join(func.__doc__.lstrip().split())
+        return descr
 
     def help(self, *argv):
         """
@@ -609,40 +862,32 @@ class upy_serial_cli:
             len(argv) == 0 or
             (
                 "-h" not in argv and
-                argv[0] not in upy_serial_cli.COMMANDS
+                argv[0] not in upy_serial_cli._COMMAND_SET
             )
         ):
             # If no argument is given or help is not specified and
             # the specified command is unknown the helpmessage contains
             # short descriptions of all known commands.
-            strout = "##### COMMANDS: #####\n\n"
+            parts = ["##### COMMANDS: #####\n\n"]
             for command in upy_serial_cli.COMMANDS:
-                strout += "##### {}: #####\n\n{}\n\n".format(
+                parts.append("##### {}: #####\n\n{}\n\n".format(
                     command,
                     self.func_descr(command)
-                )
-            strout += \
-                "####################################\n\n" \
-                "For information about a COMMAND use:\n\n" \
-                "help COMMAND\n" \
+                ))
+            parts.append(
+                "####################################\n\n"
+                "For information about a COMMAND use:\n\n"
+                "help COMMAND\n"
                 "COMMAND -h\n"
-            self.helpmsg(strout)
+            )
+            self.helpmsg("".join(parts))
         elif (
             "-h" in argv or
             argv[0] == "help"
         ):
             # Help option is specified for help command:
             # Print helpmessage for command help
-            strout = \
-                "USAGE:\n\n" \
-                "help [OPTIONS] COMMAND\n\n" \
-                "DESCRIPTION:\n\n" \
-                "{}\n\n" \
-                "OPTIONS:\n\n" \
-                "-h: Print help about this command\n\n" \
-                "COMMAND: Print help about command COMMAND" \
-                .format(self.func_descr())
-            self.helpmsg(strout)
+            self.cmd_help("help")
         else:
             # Help option is specified for a known command but help:
             # Helpmessage for specified command is printed
@@ -658,60 +903,36 @@ class upy_serial_cli:
 
         if "-h" in argv:
             # If help option is specified helpmessage is displayed.
-            strout = \
-                "USAGE:\n\n" \
-                "ls [OPTIONS] [file_1 ... file_n]\n\n" \
-                "DESCRIPTION:\n\n" \
-                "{}\n\n" \
-                "OPTIONS:\n\n" \
-                "-f: Human readable memory output format\n\n" \
-                "-h: Print help about this command\n\n" \
-                "-l: Print detailed list of " \
-                "file information\n\n" \
-                "-r: Traverse directories recursively" \
-                .format(self.func_descr())
-            self.helpmsg(strout)
+            self.cmd_help("ls")
         else:
             # Resolve arguments
-            opts = None
-            args = None
-            try:
-                opts, args = getopt.getopt(argv, "flr")
-            except getopt.GetoptError:
-                self.ls("-h")
-                return -1
-
-            # Check options:
-            # Default:
+            # Defaults:
             # - human_readable = False: Display memory output in bytes
             # - list_format = False: Display only list of filenames
             # - No recursion: Display only filenames directly below
             #   the specified path
-            human_readable = False
-            list_format = False
-            rec = False
-            for opt in opts:
-                if opt[0] == "-f":
-                    human_readable = True
-                if opt[0] == "-l":
-                    list_format = True
-                if opt[0] == "-r":
-                    rec = True
+            try:
+                opts = upy_serial_cli._LS_PARSER.parse_args(argv)
+            except SystemExit:
+                self.ls("-h")
+                return -1
 
             # If no path is given "." is set
+            args = opts.args
             if len(args) == 0:
                 args = (".", )
 
             # Run ls() on the serial-device
             args = self.argv_to_str(args)
-            self.ser_conn.open()
             self.serial_write(
                 "ls({}, human_readable={}, list_format={}, rec={})\r\n"
-                .format(args, human_readable, list_format, rec)
+                .format(
+                    args, opts.human_readable, opts.list_format,
+                    opts.rec
+                )
             )
             results = self.serial_read()
-            self.ser_conn.close()
-            print(self.extract_results(results))
+            self.print_results(self.extract_results(results))
 
     def mkdir(self, *argv):
         """
@@ -720,16 +941,7 @@ class upy_serial_cli:
 
         if len(argv) == 0 or "-h" in argv[0]:
             # If help option is specified helpmessage is displayed.
-            strout = \
-                "USAGE:\n\n" \
-                "mkdir [OPTIONS] <dir_1> [dir_2 ... dir_n]\n\n" \
-                "DESCRIPTION:\n\n" \
-                "{}\n\n" \
-                "OPTIONS:\n\n" \
-                "-h: Print help about this commandi\n\n" \
-                "-p: Create parent directories if not existent" \
-                .format(self.func_descr())
-            self.helpmsg(strout)
+            self.cmd_help("mkdir")
         else:
             pass
 
@@ -741,27 +953,7 @@ class upy_serial_cli:
 
         if "-h" in argv:
             # If help option is specified helpmessage is displayed.
-            strout = \
-                "USAGE:\n\n" \
-                "mv [OPTIONS] <src_1> [src_2 ... src_n]> <target>\n\n" \
-                "DESCRIPTION:\n\n" \
-                "{}\n\n" \
-                "On default sources are interpreted as local " \
-                "files / directories, whereas the destination " \
-                "is interpreted as a path on the " \
-                "serial-device.\n\n" \
-                "Moving files from local source to local " \
-                "destination is not permitted. Use the actual " \
-                "\"mv\"-command (man 1 mv) for that " \
-                "operation\n\n" \
-                "OPTIONS:\n\n" \
-                "-h: Print help about this command\n\n" \
-                "-s <serial|local>: Copy sources from the " \
-                "serial- / local device\n\n" \
-                "-d <serial|local>: Copy to destination on the " \
-                "serial- / local device" \
-                .format(self.func_descr())
-            self.helpmsg(strout)
+            self.cmd_help("mv")
         else:
             pass
 
@@ -772,6 +964,18 @@ class upy_serial_cli:
 
         print(msg, file=sys.stderr)
 
+    def print_results(self, payload):
+        """
+        This function writes a result payload to STDOUT. The
+        payload is written as the raw bytes the device sent,
+        bypassing stdout's text-mode encoding pass.
+        """
+
+        out = sys.stdout.buffer
+        out.write(payload)
+        out.write(b"\n")
+        out.flush()
+
     def restore(self, *argv):
         """
         This function resets the serial-device by deleting the
@@ -780,20 +984,10 @@ class upy_serial_cli:
 
         if "-h" in argv:
             # If help option is specified helpmessage is displayed.
-            strout = \
-                "USAGE:\n\n" \
-                "restore [OPTIONS]\n\n" \
-                "DESCRIPTION:\n\n" \
-                "{}\n\n" \
-                "OPTIONS:\n\n" \
-                "-h: Print help about this command" \
-                .format(self.func_descr())
-            self.helpmsg(strout)
+            self.cmd_help("restore")
         else:
             # Run restore on serial device
-            self.ser_conn.open()
             self.serial_write("restore()\r\n")
-            self.ser_conn.close()
 
     def rm(self, *argv):
         """
@@ -804,16 +998,7 @@ class upy_serial_cli:
         if len(argv) == 0 or "-h" in argv:
             # If help option is specified or no path is given
             # helpmessage is displayed.
-            strout = \
-                "USAGE:\n\n" \
-                "rm [OPTIONS] <file_1> [file_2 ... file_n]\n\n" \
-                "DESCRIPTION:\n\n" \
-                "{}\n\n" \
-                "OPTIONS:\n\n" \
-                "-h: Print help about this command\n\n" \
-                "-r: Removes a directory recursively" \
-                .format(self.func_descr())
-            self.helpmsg(strout)
+            self.cmd_help("rm")
         else:
             pass
 
@@ -826,98 +1011,151 @@ class upy_serial_cli:
         if len(argv) == 0:
             usage()
 
-        command = argv[0]
-        args = argv[1::]
-        if command in upy_serial_cli.COMMANDS:
+        command, *args = argv
+        if command in upy_serial_cli._COMMAND_SET:
             m = getattr(self, command)
             m(*args)
         else:
             self.help()
 
-    def serial_fwrite(self, src, dest):
+    def serial_fwrite(self, src, dest, resolve_dest=False):
         """
         This function writes the file content over the serial-connection
-        into a file on the serial-device.
+        into a file on the serial-device. The content is sent in few
+        large statements instead of one statement per line.
         """
 
         fd = open(src, "r")
-        self.serial_write(
-            "fd = open(\"{}\", \"w\")\r\n"
-            .format(dest)
-        )
+        if resolve_dest is True:
+            # Let the device decide whether dest is a directory: if
+            # it is, the basename of the source is appended. This
+            # replaces a full is_dir round-trip per copy.
+            self.serial_write(
+                "_p = \"{}\"\r\n".format(dest)
+            )
+            self.serial_write(
+                "try: _m = uos.stat(_p)[0]\r\n"
+                "except OSError: _m = 0\r\n"
+                "\r\n"
+            )
+            self.serial_write(
+                "if _m & 0o170000 == 0o40000: "
+                "_p = _p + \"/{}\"\r\n"
+                "\r\n"
+                .format(os.path.basename(src))
+            )
+            self.serial_write("fd = open(_p, \"w\")\r\n")
+        else:
+            self.serial_write(
+                "fd = open(\"{}\", \"w\")\r\n"
+                .format(dest)
+            )
+
+        # Coalesce escaped lines into batches, so one fd.write
+        # statement covers many source lines instead of one REPL
+        # round-trip per line
+        batch = []
+        size = 0
         for line in fd:
-            for key in upy_serial_cli.SUBSTITUTES:
-                line = line.replace(
-                    key,
-                    upy_serial_cli.SUBSTITUTES[key]
+            line = line.translate(upy_serial_cli.TRANSLATE_TABLE)
+            batch.append(line)
+            size += len(line)
+            if size >= upy_serial_cli.DEFAULT_FWRITE_BATCH_SIZE:
+                self.serial_write(
+                    "fd.write(\'{}\'.encode(\"utf-8\"))\r\n"
+                    .format("".join(batch))
                 )
+                batch = []
+                size = 0
+        if batch:
             self.serial_write(
                 "fd.write(\'{}\'.encode(\"utf-8\"))\r\n"
-                .format(line),
+                .format("".join(batch))
             )
         self.serial_write("fd.close()\r\n")
+        fd.close()
 
-    def serial_read(self):
+    def serial_read(self, sentinel=None):
         """
-        This function reads via serial-connection.
+        This function reads via serial-connection. It blocks until
+        the sentinel (END_RES on default) arrives and returns the
+        raw bytes immediately. Once the reader-thread runs, it
+        collects every frame of the current reply (a command may
+        answer with several, e.g. cat with more than one file)
+        until the reader queues the end-of-reply marker. The
+        timeout is a deadline on inactivity, not on the whole
+        reply, so long transfers are not cut off; a genuinely
+        timed-out read returns the frames collected so far.
+        Decoding is left to the caller, which usually only needs
+        the payload between the framing markers.
         """
 
-        result = b""
-        read_bytes = upy_serial_cli.DEFAULT_SER_RDBUF_SIZE
-        while (
-            read_bytes ==
-                upy_serial_cli.DEFAULT_SER_RDBUF_SIZE
-        ):
-            buf = self.ser_conn.read(
-                upy_serial_cli.DEFAULT_SER_RDBUF_SIZE
-            )
-            read_bytes = len(buf)
-            result += buf
-            self.ser_conn.flush()
-        return result.decode("utf-8")
+        if sentinel is None:
+            sentinel = upy_serial_cli.END_RES_B
+
+        # Before the reader-thread is up (the connect probe), the
+        # port is read directly
+        if self._rx_thread is None:
+            return self.ser_conn.read_until(sentinel)
 
-    def serial_write(self, buf, t_wait=None):
+        frames = []
+        while True:
+            try:
+                frame = self._rx_q.get(
+                    timeout=upy_serial_cli.DEFAULT_TIMEOUT
+                )
+            except queue.Empty:
+                # While bytes keep arriving the reply is still on
+                # its way and the wait continues
+                if (
+                    time.monotonic() - self._last_rx <
+                    upy_serial_cli.DEFAULT_TIMEOUT
+                ):
+                    continue
+                break
+            if frame is None:
+                break
+            frames.append(frame)
+
+        return b"".join(frames)
+
+    def serial_write(self, buf):
         """
         This function writes buffer-content via serial-connection.
+        pyserial handles partial writes internally, so the content is
+        encoded and written once; flush() blocks until the UART
+        buffer is drained.
         """
 
-        if t_wait is None:
-            t_wait = upy_serial_cli.DEFAULT_WAIT
-
-        written_bytes = upy_serial_cli.DEFAULT_SER_WRBUF_SIZE
-        offset = 0
-        end = upy_serial_cli.DEFAULT_SER_WRBUF_SIZE
-        while (
-            written_bytes ==
-                upy_serial_cli.DEFAULT_SER_WRBUF_SIZE
-        ):
-            written_bytes = self.ser_conn.write(
-                buf[offset:end:].encode("utf-8")
-            )
-            if t_wait > 0:
-                time.sleep(t_wait)
-            offset += written_bytes
-            end = offset + upy_serial_cli.DEFAULT_SER_WRBUF_SIZE
+        self.ser_conn.write(buf.encode("utf-8"))
+        self.ser_conn.flush()
 
     def start(self, prompt="upy_serial_cli> "):
         """
         This function starts the cli, to interact with the
-        serial-device.
+        serial-device. input() integrates with readline, so the
+        shell gets history and line editing; shlex tokenizes quoted
+        pathes correctly.
         """
 
-        print(prompt, end="", flush=True)
         while True:
-            command = sys.stdin.readline()
-            command = command.split()
+            try:
+                command = shlex.split(input(prompt))
+            except EOFError:
+                return
+            except ValueError as err:
+                # Unbalanced quotes
+                print(err, file=sys.stderr)
+                continue
             if (
                 len(command) > 0 and
-                command[0] in upy_serial_cli.COMMANDS
+                command[0] in upy_serial_cli._COMMAND_SET
             ):
-                m = getattr(self, command[0])
-                m(*command[1::])
+                cmd, *args = command
+                m = getattr(self, cmd)
+                m(*args)
             else:
                 self.help()
-            print(prompt, end="", flush=True)
 
     def sysinfo(self, *argv):
         """
@@ -927,88 +1165,46 @@ class upy_serial_cli:
 
         if "-h" in argv:
             # If help option is specified helpmessage is displayed.
-            strout = \
-                "USAGE:\n\n" \
-                "sysinfo [OPTIONS]\n\n" \
-                "DESCRIPTION:\n\n" \
-                "{}\n\n" \
-                "OPTIONS:\n\n" \
-                "-h: Print help about this command\n\n" \
-                "-q QUERY: Specifies the query which information are " \
-                "required\n\n" \
-                "QUERIES:\n\n" \
-                "all: All MEMORY QUERIES and SYSTEM QUERIES (default)\n" \
-                "all_mem: All MEMORY QUERIES\n" \
-                "all_sys: All SYSTEM QUERIES\n\n" \
-                "MEMORY QUERIES:\n\n" \
-                "avail: Available memory space for users\n" \
-                "bsize: Blocksize\n" \
-                "free: Free memory space on serial-device\n" \
-                "frsize: Fragment size\n" \
-                "size: Total memory space of serial-device\n\n" \
-                "SYSTEM QUERIES:\n\n" \
-                "fwver: Micropython firmware version\n" \
-                "hostname: Hostname of the serial-device\n" \
-                "hwrelease: Hardware release of the device\n" \
-                "machine: Machine label of serial-device\n" \
-                "sysname: System name of serial-device" \
-                .format(self.func_descr())
-            self.helpmsg(strout)
+            self.cmd_help("sysinfo")
         else:
             # Resolve arguments
-            opts = None
-            args = None
-            try:
-                opts, args = getopt.getopt(argv, "q:")
-            except getopt.GetoptError:
-                self.ls("-h")
-                return -1
-
-            # Check options:
             # Default:
             # - query = "all"
-            query = "all"
-            for opt in opts:
-                if opt[0] == "-q":
-                    query = opt[1]
+            try:
+                opts = upy_serial_cli._SYSINFO_PARSER.parse_args(argv)
+            except SystemExit:
+                self.sysinfo("-h")
+                return -1
 
-            # Run sysinfo(query)
-            self.ser_conn.open()
-            self.serial_write("sysinfo(query=\"{}\")\r\n".format(query))
-            results = self.serial_read()
-            self.ser_conn.close()
-            print(self.extract_results(results))
+            # Static queries are answered from the session-cache
+            # after their first round-trip
+            results = self._sys_cache.get(opts.query)
+            if results is None:
+                # Run sysinfo(query)
+                self.serial_write(
+                    "sysinfo(query=\"{}\")\r\n".format(opts.query)
+                )
+                results = self.extract_results(self.serial_read())
+                if opts.query in upy_serial_cli.STATIC_QUERIES:
+                    self._sys_cache[opts.query] = results
+            self.print_results(results)
 
 
 if __name__ == "__main__":
-    opts = None
-    args = None
+    # Everything from the command word on is captured as the
+    # remainder and passed through to run()
     try:
-        opts, args = getopt.getopt(sys.argv[1::], "b:hp:i")
-    except getopt.GetoptError:
+        ns = _PARSER.parse_args()
+    except SystemExit:
         usage()
 
-    if len(opts) == 0:
-        usage()
-    if ("-h", "") in opts:
+    if ns.help is True:
         usage(is_err=False)
-
-    port = None
-    baudrate = None
-    interactive = False
-    for opt in opts:
-        if opt[0] == "-p":
-            port = opt[1]
-        if opt[0] == "-b":
-            baudrate = opt[1]
-        if opt[0] == "-i":
-            interactive = True
-
-    if port is None:
+    if ns.port is None:
         usage()
 
-    cli = upy_serial_cli(port, baudrate)
-    if interactive is True:
+    cli = upy_serial_cli(ns.port, ns.baudrate)
+    if ns.interactive is True:
         cli.start()
     else:
-        cli.run(*args)
+        cli.run(*ns.args)